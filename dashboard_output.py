@@ -1,12 +1,138 @@
+import io
+import re
+from types import MappingProxyType
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+
+# Above this many nodes the per-node labels are skipped to keep rendering fast
+MAX_LABELLED_NODES = 200
+
+# Number of distinct node sets whose rendered network plot stays cached
+NETWORK_PLOT_CACHE_ENTRIES = 32
+
+# Number of distinct uploaded CSV files whose parsed frame stays cached
+CSV_CACHE_ENTRIES = 8
+
+# Columns read from an uploaded nodes CSV and their parse dtypes
+NODE_CSV_DTYPES = {'node': np.int64, 'elevation': np.float64}
+
+# NumPy dtypes of the numeric conduit columns
+CONDUIT_DTYPES = {
+    'length': np.float64,
+    'diameter': np.float64,
+    'thickness': np.float64,
+    'manning': np.float64,
+    'celerity': np.float64,
+    'cplus': np.float64,
+    'cminus': np.float64,
+    'numseg': np.int64
+}
+
+# Matches a whole "NODE <number>" / "ELEM <id>" query line in the analysis input
+ANALYSIS_INPUT_PATTERN = re.compile(r'^(NODE|ELEM)[ \t]+(\S+)[^\r\n]*', re.MULTILINE)
+
+# Example results, shared read-only by every matching node/element
+NODE_RESULT_TEMPLATE = MappingProxyType({"Q": 100, "HEAD": 50, "PRESSURE": 300})
+ELEM_RESULT_TEMPLATE = MappingProxyType({"Q": 200, "ELEV": 30})
+
+GRAVITY = 9.81  # m/s^2
+
+def _solve_moc(length, diameter, manning, celerity, cplus, cminus, numseg,
+               h_reservoir, schedule_time, schedule_discharge, dtcomp, tmax):
+    """Method-of-characteristics transient solve, one independent conduit at a time.
+
+    Only called through _compiled_moc_solver, which JIT-compiles it with numba.
+
+    Each conduit runs from the reservoir (entrance loss cplus/cminus by flow
+    direction) to a downstream end following the flow schedule. Returns the
+    final upstream discharge and the min/max head of every conduit; conduits
+    with a non-positive length, diameter or celerity get NaN.
+    """
+    n_conduits = length.shape[0]
+    q_final = np.full(n_conduits, np.nan)
+    h_max = np.full(n_conduits, np.nan)
+    h_min = np.full(n_conduits, np.nan)
+
+    for c in range(n_conduits):
+        if length[c] <= 0.0 or diameter[c] <= 0.0 or celerity[c] <= 0.0:
+            continue
+
+        # Enough segments that the Courant step dx / a never exceeds dtcomp
+        nseg = max(numseg[c], int(np.ceil(length[c] / (celerity[c] * dtcomp))))
+        dx = length[c] / nseg
+        dt = dx / celerity[c]
+        area = 0.25 * np.pi * diameter[c] ** 2
+        b = celerity[c] / (GRAVITY * area)
+        # Manning friction loss over one segment is r * Q|Q|
+        r = dx * manning[c] ** 2 / (area ** 2 * (0.25 * diameter[c]) ** (4.0 / 3.0))
+        k_plus = cplus[c] / (2.0 * GRAVITY * area ** 2)
+        k_minus = cminus[c] / (2.0 * GRAVITY * area ** 2)
+
+        # Steady initial state at the scheduled discharge for t = 0
+        q0 = np.interp(0.0, schedule_time, schedule_discharge)
+        loss = q0 * abs(q0)
+        q = np.full(nseg + 1, q0)
+        h = np.empty(nseg + 1)
+        h[0] = h_reservoir - (k_plus if q0 >= 0.0 else k_minus) * loss
+        for i in range(1, nseg + 1):
+            h[i] = h[0] - i * r * loss
+        hi = h.max()
+        lo = h.min()
+
+        q_next = np.empty(nseg + 1)
+        h_next = np.empty(nseg + 1)
+        for step in range(1, int(np.ceil(tmax / dt)) + 1):
+            # Interior points: intersection of the C+ and C- characteristics
+            for i in range(1, nseg):
+                cp = h[i - 1] + b * q[i - 1] - r * q[i - 1] * abs(q[i - 1])
+                cm = h[i + 1] - b * q[i + 1] + r * q[i + 1] * abs(q[i + 1])
+                h_next[i] = 0.5 * (cp + cm)
+                q_next[i] = (cp - cm) / (2.0 * b)
+
+            # Upstream reservoir: solve the C- line against the entrance loss
+            cm = h[1] - b * q[1] + r * q[1] * abs(q[1])
+            d = h_reservoir - cm
+            if d >= 0.0:
+                q_next[0] = 2.0 * d / (b + np.sqrt(b * b + 4.0 * k_plus * d))
+            else:
+                q_next[0] = 2.0 * d / (b + np.sqrt(b * b - 4.0 * k_minus * d))
+            h_next[0] = cm + b * q_next[0]
+
+            # Downstream end: discharge imposed by the flow schedule
+            cp = h[nseg - 1] + b * q[nseg - 1] - r * q[nseg - 1] * abs(q[nseg - 1])
+            q_next[nseg] = np.interp(step * dt, schedule_time, schedule_discharge)
+            h_next[nseg] = cp - b * q_next[nseg]
+
+            q, q_next = q_next, q
+            h, h_next = h_next, h
+            hi = max(hi, h.max())
+            lo = min(lo, h.min())
+
+        q_final[c] = q[0]
+        h_max[c] = hi
+        h_min[c] = lo
+
+    return q_final, h_max, h_min
 
 class HydraulicNetworkAnalysis:
     def __init__(self):
         self.nodes = {}
-        self.conduits = {}
+        # Columnar conduit storage: one list per field, typed on read via CONDUIT_DTYPES
+        self.conduits = {
+            'id': [],
+            'length': [],
+            'diameter': [],
+            'thickness': [],
+            'manning': [],
+            'material': [],
+            'celerity': [],
+            'cplus': [],
+            'cminus': [],
+            'numseg': []
+        }
+        self._conduit_rows = {}  # conduit id -> row in the columns
         self.surge_tank = {}
         self.orifice = {}
         self.reservoir = {}
@@ -17,9 +143,14 @@ class HydraulicNetworkAnalysis:
         """Add a node to the network"""
         self.nodes[node_number] = elevation
 
+    def add_nodes_from_frame(self, df):
+        """Add every node in a DataFrame with 'node' and 'elevation' columns"""
+        self.nodes.update(zip(df['node'].to_numpy().tolist(),
+                              df['elevation'].to_numpy().tolist()))
+
     def add_conduit(self, conduit_id, length, diameter, thickness, manning, material, celerity, cplus, cminus, numseg):
         """Add a conduit to the network"""
-        self.conduits[conduit_id] = {
+        values = {
             'length': length,
             'diameter': diameter,
             'thickness': thickness,
@@ -30,6 +161,21 @@ class HydraulicNetworkAnalysis:
             'cminus': cminus,
             'numseg': numseg
         }
+        row = self._conduit_rows.get(conduit_id)
+        if row is not None:
+            # Re-adding an existing conduit overwrites its row
+            for field, value in values.items():
+                self.conduits[field][row] = value
+            return
+
+        self._conduit_rows[conduit_id] = len(self.conduits['id'])
+        self.conduits['id'].append(conduit_id)
+        for field, value in values.items():
+            self.conduits[field].append(value)
+
+    def conduit_array(self, field):
+        """Return a numeric conduit column as a typed NumPy array"""
+        return np.asarray(self.conduits[field], dtype=CONDUIT_DTYPES[field])
 
     def set_surge_tank(self, diameter, top_elevation, bottom_elevation, material, thickness, manning, celerity):
         """Set surge tank properties"""
@@ -73,48 +219,295 @@ class HydraulicNetworkAnalysis:
         }
 
     def visualize_network(self):
-        """Create a visualization of the hydraulic network"""
+        """Create a visualization of the hydraulic network as PNG bytes"""
         if not self.nodes:
             st.warning("No nodes defined. Please add nodes first.")
             return None
 
-        plt.figure(figsize=(12, 6))
-        
-        # Plot nodes
-        for node, elevation in self.nodes.items():
-            plt.scatter(node, elevation, c='blue', s=100)
-            plt.text(node, elevation, f'Node {node}\n{elevation}m', 
-                     verticalalignment='bottom', horizontalalignment='center')
-        
-        plt.title('Hydraulic Network Node Elevations')
-        plt.xlabel('Node Number')
-        plt.ylabel('Elevation (m)')
-        plt.tight_layout()
-        return plt
-
-    def analyze_network(self, inputs):
-        """Perform network analysis and return results"""
-        results = {}
-        for input_item in inputs:
-            if input_item.startswith("NODE"):
-                node_number = int(input_item.split()[1])
-                results[node_number] = {
-                    "Q": 100,  # Example data
-                    "HEAD": 50,  # Example data
-                    "PRESSURE": 300  # Example data
-                }
-            elif input_item.startswith("ELEM"):
-                elem_id = input_item.split()[1]
-                results[elem_id] = {
-                    "Q": 200,  # Example data
-                    "ELEV": 30  # Example data
-                }
-        return results
+        return _render_network_png(tuple(sorted(self.nodes.items())))
+
+    def analyze_network(self, text):
+        """Perform network analysis on the NODE/ELEM queries in text and return results"""
+        return {key: values for _, key, values in self.iter_analysis(text)}
+
+    def iter_analysis(self, text):
+        """Yield (query line, key, results) for each NODE/ELEM query in text, in one pass"""
+        conduit_results = None
+        for match in ANALYSIS_INPUT_PATTERN.finditer(text):
+            kind, ident = match.groups()
+            if kind == "NODE":
+                try:
+                    node_number = int(ident)
+                except ValueError:
+                    st.error(f"Invalid node number in query: {match.group(0)}")
+                    continue
+                yield match.group(0), node_number, NODE_RESULT_TEMPLATE
+            else:
+                # Solve the conduits only once, and only if an ELEM is queried
+                if conduit_results is None:
+                    conduit_results = self.solve_conduits()
+                yield match.group(0), ident, conduit_results.get(ident, ELEM_RESULT_TEMPLATE)
+
+    def solve_conduits(self):
+        """Run the transient solver on every conduit and return results by conduit ID"""
+        params = self.computational_params
+        if not self.conduits['id'] or not self.reservoir or params.get('dtcomp', 0) <= 0:
+            return {}
+
+        solver = _compiled_moc_solver()
+        if solver is None:
+            # Uncompiled, the solve takes tens of seconds per submit
+            st.warning("Install numba to run the conduit solver; showing example data.")
+            return {}
+
+        schedule_time = np.asarray(self.flow_schedule.get('time', [0.0]), dtype=np.float64)
+        schedule_discharge = np.asarray(self.flow_schedule.get('discharge', [0.0]), dtype=np.float64)
+        q_final, h_max, h_min = solver(
+            self.conduit_array('length'), self.conduit_array('diameter'), self.conduit_array('manning'),
+            self.conduit_array('celerity'), self.conduit_array('cplus'), self.conduit_array('cminus'),
+            self.conduit_array('numseg'), float(self.reservoir['water_level']),
+            schedule_time, schedule_discharge, float(params['dtcomp']), float(params['tmax'])
+        )
+        return {
+            conduit_id: {"Q": q, "HMAX": hi, "HMIN": lo}
+            for conduit_id, q, hi, lo in zip(self.conduits['id'], q_final.tolist(),
+                                             h_max.tolist(), h_min.tolist())
+        }
+
+@st.cache_resource
+def _compiled_moc_solver():
+    """JIT-compile _solve_moc once per process, or return None without numba"""
+    try:
+        from numba import njit  # deferred so app start-up skips numba
+    except ImportError:
+        return None
+    return njit(cache=True)(_solve_moc)
+
+def _node_arrays(nodes_items):
+    """Split (node, elevation) items into int64 node number and float64 elevation arrays"""
+    count = len(nodes_items)
+    node_numbers = np.fromiter((node for node, _ in nodes_items), dtype=np.int64, count=count)
+    elevations = np.fromiter((elevation for _, elevation in nodes_items), dtype=np.float64, count=count)
+    return node_numbers, elevations
+
+@st.cache_data(max_entries=NETWORK_PLOT_CACHE_ENTRIES)
+def _render_network_png(nodes_items):
+    """Render the node elevation plot to PNG bytes, cached on the (node, elevation) items"""
+    from matplotlib.figure import Figure  # deferred so app start-up skips matplotlib
+
+    # A standalone Figure stays out of pyplot's global registry and shared state
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    
+    # Plot all nodes as a single collection
+    node_numbers, elevations = _node_arrays(nodes_items)
+    ax.scatter(node_numbers, elevations, c='blue', s=100)
+
+    if len(nodes_items) <= MAX_LABELLED_NODES:
+        for node, elevation in nodes_items:
+            ax.text(node, elevation, f'Node {node}\n{elevation}m', 
+                    verticalalignment='bottom', horizontalalignment='center')
+    
+    ax.set_title('Hydraulic Network Node Elevations')
+    ax.set_xlabel('Node Number')
+    ax.set_ylabel('Elevation (m)')
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=200, bbox_inches='tight')
+    return buf.getvalue()
+
+@st.cache_data(max_entries=CSV_CACHE_ENTRIES)
+def _load_csv(file_bytes):
+    """Parse uploaded nodes CSV bytes, cached so reruns skip re-parsing"""
+    return pd.read_csv(io.BytesIO(file_bytes), usecols=list(NODE_CSV_DTYPES), dtype=NODE_CSV_DTYPES)
+
+def _nodes_df(nodes_items):
+    """Build the nodes table from the (node, elevation) items"""
+    node_numbers, elevations = _node_arrays(nodes_items)
+    return pd.DataFrame({'Elevation (m)': elevations},
+                        index=pd.Index(node_numbers, name='Node Number'))
+
+def _conduits_df(conduits):
+    """Build the conduits table from the columnar storage"""
+    # Numeric columns become typed arrays once here; material is the only text column
+    return (pd.DataFrame({
+                field: np.asarray(column, dtype=CONDUIT_DTYPES[field]) if field in CONDUIT_DTYPES else column
+                for field, column in conduits.items()
+            })
+            .astype({'material': 'category'})
+            .set_index('id')
+            .rename_axis('Conduit ID'))
+
+@st.fragment
+def _nodes_section(analysis):
+    """Node input form and current nodes table"""
+    st.header("Node Input")
+    with st.form("node_input", clear_on_submit=True):
+        node_number = st.number_input("Node Number", min_value=1, step=1)
+        elevation = st.number_input("Elevation (m)", min_value=0.0, step=0.1)
+        submit = st.form_submit_button("Add Node")
+    
+        if submit:
+            analysis.add_node(node_number, elevation)
+            st.success(f"Node {node_number} added with elevation {elevation}m")
+
+    # Display current nodes
+    if analysis.nodes:
+        st.subheader("Current Nodes")
+        st.dataframe(_nodes_df(analysis.nodes.items()))
+
+@st.fragment
+def _conduits_section(analysis):
+    """Conduit input form and current conduits table"""
+    st.header("Conduit Input")
+    with st.form("conduit_input", clear_on_submit=True):
+        conduit_id = st.text_input("Conduit ID")
+        length = st.number_input("Length (m)", min_value=0.0, step=0.1)
+        diameter = st.number_input("Diameter (m)", min_value=0.0, step=0.1)
+        thickness = st.number_input("Thickness (m)", min_value=0.0, step=0.001)
+        manning = st.number_input("Manning's Coefficient", min_value=0.0, step=0.001)
+        material = st.selectbox("Material", ["Concrete", "Steel"])
+        celerity = st.number_input("Celerity (m/s)", min_value=0.0, step=1.0)
+        cplus = st.number_input("CPLUS", min_value=0.0, step=0.01)
+        cminus = st.number_input("CMINUS", min_value=0.0, step=0.01)
+        numseg = st.number_input("NUMSEG", min_value=1, step=1)
+        submit = st.form_submit_button("Add Conduit")
+    
+        if submit:
+            analysis.add_conduit(conduit_id, length, diameter, thickness, 
+                                 manning, material, celerity, 
+                                 cplus, cminus, numseg)
+            st.success(f"Conduit {conduit_id} added")
+
+    # Display current conduits
+    if analysis.conduits['id']:
+        st.subheader("Current Conduits")
+        st.dataframe(_conduits_df(analysis.conduits))
+
+@st.fragment
+def _reservoir_section(analysis):
+    """Reservoir water level form and current value"""
+    st.header("Reservoir Input")
+    with st.form("reservoir_input"):
+        water_level = st.number_input("Water Level (m)", min_value=0.0, step=0.1)
+        submit = st.form_submit_button("Set Reservoir")
+    
+        if submit:
+            analysis.set_reservoir(water_level)
+            st.success(f"Reservoir water level set to {water_level}m")
+
+    # Display reservoir
+    if analysis.reservoir:
+        st.subheader("Reservoir")
+        st.json(analysis.reservoir)
+
+@st.fragment
+def _flow_schedule_section(analysis):
+    """Downstream flow schedule form and current schedule"""
+    st.header("Flow Schedule Input")
+    with st.form("flow_schedule_input"):
+        time_text = st.text_input("Time Points (s), comma separated", value="0")
+        discharge_text = st.text_input("Discharge Points (m³/s), comma separated", value="0")
+        submit = st.form_submit_button("Set Flow Schedule")
+    
+        if submit:
+            try:
+                time_points = [float(v) for v in time_text.split(",") if v.strip()]
+                discharge_points = [float(v) for v in discharge_text.split(",") if v.strip()]
+            except ValueError as e:
+                st.error(f"Flow schedule points must be numbers: {e}")
+            else:
+                if not time_points or len(time_points) != len(discharge_points):
+                    st.error("Enter the same number of time and discharge points")
+                elif any(t1 <= t0 for t0, t1 in zip(time_points, time_points[1:])):
+                    st.error("Time points must be strictly increasing")
+                else:
+                    analysis.add_flow_schedule(time_points, discharge_points)
+                    st.success("Flow schedule set")
+
+    # Display flow schedule
+    if analysis.flow_schedule:
+        st.subheader("Flow Schedule")
+        st.dataframe(pd.DataFrame({
+            'Time (s)': analysis.flow_schedule['time'],
+            'Discharge (m³/s)': analysis.flow_schedule['discharge']
+        }))
+
+@st.fragment
+def _computational_params_section(analysis):
+    """Computational parameters form and current values"""
+    st.header("Computational Parameters")
+    with st.form("comp_params_input"):
+        dtcomp = st.number_input("DTCOMP", value=0.01, min_value=0.0, step=0.01)
+        dtout = st.number_input("DTOUT", value=0.1, min_value=0.0, step=0.1)
+        tmax = st.number_input("TMAX", value=500.0, min_value=0.0, step=1.0)
+        submit = st.form_submit_button("Set Parameters")
+    
+        if submit:
+            analysis.set_computational_params(dtcomp, dtout, tmax)
+            st.success("Computational parameters set")
+
+    # Display computational parameters
+    if analysis.computational_params:
+        st.subheader("Computational Parameters")
+        st.json(analysis.computational_params)
+
+@st.fragment
+def _network_analysis_section(analysis):
+    """Network analysis page with the network visualization"""
+    st.header("Network Analysis")
+
+    # Network Visualization
+    st.subheader("Network Visualization")
+    network_png = analysis.visualize_network()
+    if network_png:
+        st.image(network_png)
+
+@st.fragment
+def _analysis_output_section(analysis):
+    """Network analysis query form, results and plot"""
+    st.header("Network Analysis and Output")
+    with st.form("network_analysis_output"):
+        text = st.text_area("Inputs (e.g., NODE 10\nELEM ST\nNODE 3)")
+        submit = st.form_submit_button("Analyze")
+    
+        if submit:
+            # Single pass: collect the formatted lines and the results to plot
+            results = {}
+            lines = []
+            for input_item, key, values in analysis.iter_analysis(text):
+                results[key] = values
+                lines.append(f"{input_item}: {' '.join(values)}")
+
+            st.subheader("Analysis Result")
+            st.write({key: dict(value) for key, value in results.items()})
+
+            # Print the results in the specified format
+            if lines:
+                # One markdown element instead of a message per line; two
+                # trailing spaces keep each entry on its own line
+                st.markdown("  \n".join(lines))
+
+            # Plot the results
+            if results:
+                results_df = pd.DataFrame.from_dict(results, orient='index')
+                # Node numbers are ints and element IDs strings; label both as text so
+                # NODE 10 and ELEM 10 stay distinct and the index is one type for Arrow
+                results_df.index = pd.Index(
+                    [f"NODE {key}" if isinstance(key, int) else f"ELEM {key}" for key in results],
+                    name='Node/Element'
+                )
+                # Metrics have different units, so group the bars rather than stack them
+                st.bar_chart(results_df, stack=False)
 
 def main():
     st.set_page_config(page_title="Hydraulic Network Analysis", layout="wide")
     
-    analysis = HydraulicNetworkAnalysis()
+    # Keep the network across reruns so added nodes/conduits accumulate
+    if "analysis" not in st.session_state:
+        st.session_state.analysis = HydraulicNetworkAnalysis()
+    analysis = st.session_state.analysis
 
     # Sidebar for CSV upload or manual input
     st.sidebar.title("Input Options")
@@ -124,9 +517,14 @@ def main():
         st.header("Upload CSV File")
         uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
         if uploaded_file is not None:
-            data = pd.read_csv(uploaded_file)
-            st.subheader("Uploaded Data")
-            st.dataframe(data)
+            try:
+                data = _load_csv(uploaded_file.getvalue())
+            except ValueError as e:
+                st.error(f"CSV needs numeric 'node' and 'elevation' columns: {e}")
+            else:
+                analysis.add_nodes_from_frame(data)
+                st.subheader("Uploaded Data")
+                st.dataframe(data)
 
     elif input_mode == "Manual Input":
         # Simplified Navigation for Manual Input
@@ -138,50 +536,11 @@ def main():
 
         # Nodes Input
         if menu == "Nodes":
-            st.header("Node Input")
-            with st.form("node_input"):
-                node_number = st.number_input("Node Number", min_value=1, step=1)
-                elevation = st.number_input("Elevation (m)", min_value=0.0, step=0.1)
-                submit = st.form_submit_button("Add Node")
-                
-                if submit:
-                    analysis.add_node(node_number, elevation)
-                    st.success(f"Node {node_number} added with elevation {elevation}m")
-            
-            # Display current nodes
-            if analysis.nodes:
-                st.subheader("Current Nodes")
-                nodes_df = pd.DataFrame.from_dict(analysis.nodes, orient='index', columns=['Elevation (m)'])
-                nodes_df.index.name = 'Node Number'
-                st.dataframe(nodes_df)
+            _nodes_section(analysis)
 
         # Conduits Input
         elif menu == "Conduits":
-            st.header("Conduit Input")
-            with st.form("conduit_input"):
-                conduit_id = st.text_input("Conduit ID")
-                length = st.number_input("Length (m)", min_value=0.0, step=0.1)
-                diameter = st.number_input("Diameter (m)", min_value=0.0, step=0.1)
-                thickness = st.number_input("Thickness (m)", min_value=0.0, step=0.001)
-                manning = st.number_input("Manning's Coefficient", min_value=0.0, step=0.001)
-                material = st.selectbox("Material", ["Concrete", "Steel"])
-                celerity = st.number_input("Celerity (m/s)", min_value=0.0, step=1.0)
-                cplus = st.number_input("CPLUS", min_value=0.0, step=0.01)
-                cminus = st.number_input("CMINUS", min_value=0.0, step=0.01)
-                numseg = st.number_input("NUMSEG", min_value=1, step=1)
-                submit = st.form_submit_button("Add Conduit")
-                
-                if submit:
-                    analysis.add_conduit(conduit_id, length, diameter, thickness, 
-                                         manning, material, celerity, 
-                                         cplus, cminus, numseg)
-                    st.success(f"Conduit {conduit_id} added")
-            
-            # Display current conduits
-            if analysis.conduits:
-                st.subheader("Current Conduits")
-                conduits_df = pd.DataFrame.from_dict(analysis.conduits, orient='index')
-                st.dataframe(conduits_df)
+            _conduits_section(analysis)
 
         # Additional sections for Surge Tank, Orifice, Reservoir, Flow Schedule, and Computational Parameters
         elif menu == "Surge Tank":
@@ -193,71 +552,20 @@ def main():
             # Implementation here
 
         elif menu == "Reservoir":
-            st.header("Reservoir Input")
-            # Implementation here
+            _reservoir_section(analysis)
 
         elif menu == "Flow Schedule":
-            st.header("Flow Schedule Input")
-            # Implementation here
+            _flow_schedule_section(analysis)
 
         elif menu == "Computational Parameters":
-            st.header("Computational Parameters")
-            with st.form("comp_params_input"):
-                dtcomp = st.number_input("DTCOMP", value=0.01, min_value=0.0, step=0.01)
-                dtout = st.number_input("DTOUT", value=0.1, min_value=0.0, step=0.1)
-                tmax = st.number_input("TMAX", value=500.0, min_value=0.0, step=1.0)
-                submit = st.form_submit_button("Set Parameters")
-                
-                if submit:
-                    analysis.set_computational_params(dtcomp, dtout, tmax)
-                    st.success("Computational parameters set")
-            
-            # Display computational parameters
-            if analysis.computational_params:
-                st.subheader("Computational Parameters")
-                params_df = pd.DataFrame.from_dict(analysis.computational_params, orient='index', columns=['Value'])
-                st.dataframe(params_df)
+            _computational_params_section(analysis)
 
         # Network Analysis
         elif menu == "Network Analysis":
-            st.header("Network Analysis")
-        
-        # Network Visualization
-        st.subheader("Network Visualization")
-        plt_fig = analysis.visualize_network()
-        if plt_fig:
-            st.pyplot(plt_fig)
+            _network_analysis_section(analysis)
 
     # Network Analysis and Output
-    st.header("Network Analysis and Output")
-    with st.form("network_analysis_output"):
-        inputs = st.text_area("Inputs (e.g., NODE 10\nELEM ST\nNODE 3)").splitlines()
-        submit = st.form_submit_button("Analyze")
-        
-        if submit:
-            results = analysis.analyze_network(inputs)
-            st.subheader("Analysis Result")
-            st.write(results)
-
-            # Print the results in the specified format
-            for input_item in inputs:
-                if input_item.startswith("NODE"):
-                    st.write(f"{input_item}: Q HEAD PRESSURE")
-                elif input_item.startswith("ELEM"):
-                    st.write(f"{input_item}: Q ELEV")
-
-            # Plot the results
-            if results:
-                for key, value in results.items():
-                    for output, result in value.items():
-                        plt.figure(figsize=(10, 5))
-                        plt.plot([key], [result], marker='o', label=f'{output}')
-                        plt.title('Analysis Results')
-                        plt.xlabel('Node/Element')
-                        plt.ylabel(output)
-                        plt.legend()
-                        plt.grid(True)
-                        st.pyplot(plt)
+    _analysis_output_section(analysis)
 
 if __name__ == "__main__":
     main()